@@ -4,14 +4,83 @@ Add elevation data to argentina.json using Open Elevation API.
 Elevations are converted from meters to feet.
 """
 
+import http.client
 import json
+import threading
 import time
-import urllib.request
-import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib json module
+    orjson = None
 
 INPUT_FILE = "data/ad-lads/argentina.json"
 BATCH_SIZE = 100  # API supports multiple locations per request
 METERS_TO_FEET = 3.28084
+API_HOST = "api.open-elevation.com"
+MAX_WORKERS = 8  # concurrent batches in flight
+REQUESTS_PER_SECOND = 2  # politeness cap across all workers
+
+
+class RateLimiter:
+    """Token bucket shared by all worker threads."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                time.sleep((1 - self.tokens) / self.rate)
+
+
+limiter = RateLimiter(REQUESTS_PER_SECOND)
+local = threading.local()
+
+
+def get_connection() -> http.client.HTTPSConnection:
+    """Keep-alive connection for the current worker thread."""
+    conn = getattr(local, "conn", None)
+    if conn is None:
+        conn = local.conn = http.client.HTTPSConnection(API_HOST, timeout=30)
+    return conn
+
+
+def request_batch(path: str) -> bytes:
+    """GET `path` on this thread's connection and return the body.
+    If the server dropped the idle keep-alive socket, retry once on a
+    fresh connection."""
+    for attempt in range(2):
+        limiter.acquire()
+        conn = get_connection()
+        try:
+            conn.request("GET", path, headers={"User-Agent": "elevation-fetcher/1.0"})
+            response = conn.getresponse()
+            body = response.read()
+            break
+        except ConnectionError:
+            # Covers RemoteDisconnected, resets and broken pipes; close()
+            # makes http.client open a new socket on the next request
+            conn.close()
+            if attempt:
+                raise
+
+    if response.status != 200:
+        raise http.client.HTTPException(f"HTTP {response.status} {response.reason}")
+    return body
+
 
 def fetch_elevations(locations: list[tuple[float, float]]) -> list[int | None]:
     """Fetch elevations for a batch of locations."""
@@ -20,23 +89,21 @@ def fetch_elevations(locations: list[tuple[float, float]]) -> list[int | None]:
 
     # Build query string: lat,lon|lat,lon|...
     loc_str = "|".join(f"{lat},{lon}" for lat, lon in locations)
-    url = f"https://api.open-elevation.com/api/v1/lookup?locations={loc_str}"
+    path = f"/api/v1/lookup?locations={loc_str}"
 
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "elevation-fetcher/1.0"})
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode())
-
-        elevations = []
-        for result in data.get("results", []):
-            elev_m = result.get("elevation")
-            if elev_m is not None:
-                elev_ft = round(elev_m * METERS_TO_FEET)
-                elevations.append(elev_ft)
-            else:
-                elevations.append(None)
-        return elevations
-    except (urllib.error.URLError, json.JSONDecodeError, KeyError) as e:
+        body = request_batch(path)
+        data = orjson.loads(body) if orjson else json.loads(body)
+
+        # Meters to feet, keeping None for points the API has no data for
+        return [
+            None if (elev_m := result.get("elevation")) is None
+            else round(elev_m * METERS_TO_FEET)
+            for result in data.get("results", [])
+        ]
+    except (OSError, http.client.HTTPException, json.JSONDecodeError, KeyError) as e:
+        # Drop the connection; http.client reopens it on the next request
+        get_connection().close()
         print(f"  Error fetching batch: {e}")
         return [None] * len(locations)
 
@@ -49,27 +116,27 @@ def main():
     total = len(records)
     print(f"Processing {total} records in batches of {BATCH_SIZE}...")
 
-    # Process in batches
-    for i in range(0, total, BATCH_SIZE):
-        batch = records[i:i + BATCH_SIZE]
-        locations = [(r["lat"], r["lon"]) for r in batch]
-
-        print(f"  Batch {i // BATCH_SIZE + 1}/{(total + BATCH_SIZE - 1) // BATCH_SIZE}...", end=" ", flush=True)
-        elevations = fetch_elevations(locations)
-
-        # Assign elevations to records
-        for j, elev in enumerate(elevations):
-            records[i + j]["elevation"] = elev
+    # Fetch batches concurrently; map() yields results in batch order
+    batches = [records[i:i + BATCH_SIZE] for i in range(0, total, BATCH_SIZE)]
+    locations = ([(r["lat"], r["lon"]) for r in batch] for batch in batches)
 
-        success = sum(1 for e in elevations if e is not None)
-        print(f"{success}/{len(batch)} OK")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        results = pool.map(fetch_elevations, locations)
+        for n, (batch, elevations) in enumerate(zip(batches, results), start=1):
+            # Assign elevations to records
+            for record, elev in zip(batch, elevations):
+                record["elevation"] = elev
 
-        # Rate limiting
-        time.sleep(0.5)
+            success = sum(1 for e in elevations if e is not None)
+            print(f"  Batch {n}/{len(batches)}... {success}/{len(batch)} OK")
 
     # Save updated data
-    with open(INPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson:
+        with open(INPUT_FILE, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(INPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
     # Summary
     with_elev = sum(1 for r in records if r.get("elevation") is not None)
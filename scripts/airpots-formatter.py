@@ -1,57 +1,109 @@
 import csv
 import json
+import os
+import sys
+from operator import itemgetter
 from pathlib import Path
-from sys import argv
 
-source = argv[1] if len(argv) > 1 else "airports.csv"
-dest = argv[2] if len(argv) > 2 else source.replace(".csv", ".json")
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
+source = sys.argv[1] if len(sys.argv) > 1 else "airports.csv"
+dest = sys.argv[2] if len(sys.argv) > 2 else source.replace(".csv", ".json")
 
 INPUT_FILE = Path(source)
 OUTPUT_FILE = Path(dest)
+BUFFER_SIZE = 1 << 20  # 1 MiB; fewer read/write syscalls than the 8 KiB default
+
+def encode(airport: tuple) -> bytes:
+    """Compact JSON (no spaces) with UTF-8 for a single airport record."""
+    if orjson:
+        return orjson.dumps(airport)
+    return json.dumps(
+        airport,
+        ensure_ascii=False,          # preserve accents and special chars
+        separators=(",", ":")        # compact format
+    ).encode("utf-8")
 
 def main():
-    airports = []
-
-    with INPUT_FILE.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Use ICAO if available, otherwise fallback to ident
-            icao = (row.get("icao_code") or "").strip()
-            ident = (row.get("ident") or "").strip()
-
-            code = icao or ident
-            if not code:
-                continue
-
-            lat = row.get("latitude_deg")
-            lon = row.get("longitude_deg")
-            name = (row.get("name") or "").strip()
-            elevation = row.get("elevation_ft")
-
-            # Skip if essential fields are missing
-            if not lat or not lon or not name:
-                continue
-
-            try:
-                lat_f = float(lat)
-                lon_f = float(lon)
-                elev_f = int(float(elevation)) if elevation else None
-            except ValueError:
-                continue
-
-            # Compact format: [ICAO, lat, lon, name, elevation_ft]
-            airports.append([code, lat_f, lon_f, name, elev_f])
-
-    # Compact dump (no spaces) with UTF-8
-    with OUTPUT_FILE.open("w", encoding="utf-8") as f:
-        json.dump(
-            airports,
-            f,
-            ensure_ascii=False,          # preserve accents and special chars
-            separators=(",", ":")        # compact format
-        )
-
-    print(f"Wrote {len(airports)} airports to {OUTPUT_FILE}")
+    if INPUT_FILE.resolve() == OUTPUT_FILE.resolve():
+        print(f"Error: output {OUTPUT_FILE} would overwrite the input")
+        sys.exit(1)
+
+    count = 0
+
+    # Stream records to a temp file as they are parsed instead of holding
+    # the whole list in memory first, and only move it over OUTPUT_FILE
+    # once the whole CSV went through, so a failed run never leaves a
+    # truncated file behind
+    tmp_file = OUTPUT_FILE.with_name(OUTPUT_FILE.name + ".tmp")
+    try:
+        with (
+            INPUT_FILE.open(newline="", encoding="utf-8", buffering=BUFFER_SIZE) as f,
+            tmp_file.open("wb", buffering=BUFFER_SIZE) as out,
+        ):
+            reader = csv.reader(f)
+
+            # Resolve column positions once from the header row
+            header = next(reader, None)
+            if header is None:
+                print(f"Error: {INPUT_FILE} is empty")
+                sys.exit(1)
+            idx = {h: i for i, h in enumerate(header)}
+
+            # Pull every column we need out of a row in a single C-level call
+            columns = itemgetter(
+                idx["icao_code"],
+                idx["ident"],
+                idx["latitude_deg"],
+                idx["longitude_deg"],
+                idx["name"],
+                idx["elevation_ft"],
+            )
+
+            # Drop blank lines (csv.reader yields them as []) and pad short
+            # rows with empty fields, as DictReader did for missing columns
+            ncols = len(header)
+            rows = (
+                row if len(row) >= ncols else row + [""] * (ncols - len(row))
+                for row in reader
+                if row
+            )
+
+            out.write(b"[")
+            for icao, ident, lat, lon, name, elevation in map(columns, rows):
+                # Use ICAO if available, otherwise fallback to ident
+                code = icao.strip() or ident.strip()
+                if not code:
+                    continue
+
+                name = name.strip()
+
+                # Skip if essential fields are missing
+                if not lat or not lon or not name:
+                    continue
+
+                try:
+                    lat_f = float(lat)
+                    lon_f = float(lon)
+                    elev_f = int(float(elevation)) if elevation else None
+                except ValueError:
+                    continue
+
+                # Compact format: [ICAO, lat, lon, name, elevation_ft]
+                if count:
+                    out.write(b",")
+                out.write(encode((code, lat_f, lon_f, name, elev_f)))
+                count += 1
+            out.write(b"]")
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_file, OUTPUT_FILE)
+
+    print(f"Wrote {count} airports to {OUTPUT_FILE}")
 
 if __name__ == "__main__":
     main()
@@ -18,10 +18,18 @@ Surface categories:
 import csv
 import json
 import sys
+from collections import defaultdict
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
 INPUT_FILE = Path.home() / "Downloads" / "runways.csv"
 OUTPUT_FILE = Path(__file__).parent.parent / "data" / "runways.json"
+BUFFER_SIZE = 1 << 20  # 1 MiB; fewer read/write syscalls than the 8 KiB default
 
 # Map raw surface codes to standardized categories
 # PG = Pavement Good, PP = Pavement Poor, GG = Grass Good, GF = Grass Fair
@@ -88,10 +96,26 @@ SURFACE_CATEGORIES = {
     "ICE": "WT", "BLU": "WT",  # ice, blue ice
 }
 
+# Raw surface string -> resolved category (or None), seeded with the known
+# codes and filled in by categorize_surface() as new spellings show up, so
+# a repeated surface costs a single dict lookup
+SURFACE_LOOKUP: dict[str, str | None] = dict(SURFACE_CATEGORIES)
+
+# Per-end CSV columns, in the order build_runway_end() unpacks them
+LE_FIELDS = (
+    "le_ident", "le_latitude_deg", "le_longitude_deg",
+    "le_elevation_ft", "le_heading_degT", "le_displaced_threshold_ft",
+)
+HE_FIELDS = (
+    "he_ident", "he_latitude_deg", "he_longitude_deg",
+    "he_elevation_ft", "he_heading_degT", "he_displaced_threshold_ft",
+)
+
 
 def parse_float(val: str) -> float | None:
-    """Parse float, return None if empty."""
-    if not val or val.strip() == "":
+    """Parse float, return None if empty or blank.
+    float() ignores surrounding whitespace, so no strip() is needed."""
+    if not val:
         return None
     try:
         return float(val)
@@ -100,9 +124,16 @@ def parse_float(val: str) -> float | None:
 
 
 def parse_int(val: str) -> int | None:
-    """Parse int, return None if empty."""
-    if not val or val.strip() == "":
+    """Parse int, return None if empty or blank.
+    int() ignores surrounding whitespace, so no strip() is needed."""
+    if not val:
         return None
+    try:
+        # Integer columns are almost always plain digits; only go through
+        # float() for values like "2500.0"
+        return int(val)
+    except ValueError:
+        pass
     try:
         return int(float(val))
     except ValueError:
@@ -110,91 +141,141 @@ def parse_int(val: str) -> int | None:
 
 
 def categorize_surface(surface: str) -> str | None:
-    """Categorize surface type into standard categories.
+    """Categorize an already-stripped surface type into standard categories.
     Returns None if surface cannot be identified."""
-    s = surface.upper().strip()
-    if not s:
-        return None
+    try:
+        return SURFACE_LOOKUP[surface]
+    except KeyError:
+        pass
 
-    # Direct match
-    if s in SURFACE_CATEGORIES:
-        return SURFACE_CATEGORIES[s]
+    category = _resolve_surface(surface)
+    SURFACE_LOOKUP[surface] = category
+    return category
 
-    # Try first 3 characters
-    if len(s) >= 3 and s[:3] in SURFACE_CATEGORIES:
-        return SURFACE_CATEGORIES[s[:3]]
 
-    # Try first 2 characters
-    if len(s) >= 2 and s[:2] in SURFACE_CATEGORIES:
-        return SURFACE_CATEGORIES[s[:2]]
+def _resolve_surface(surface: str) -> str | None:
+    """Match a surface string against SURFACE_CATEGORIES by prefix."""
+    s = surface.upper()
+    if not s:
+        return None
 
-    # Try first character (for A, C, D, G, S, T, W)
-    if len(s) >= 1 and s[0] in SURFACE_CATEGORIES:
-        return SURFACE_CATEGORIES[s[0]]
+    # Direct match, then the first 3, 2 and 1 characters
+    # (for A, C, D, G, S, T, W); one slice and one lookup per candidate
+    for key in (s, s[:3], s[:2], s[0]):
+        category = SURFACE_CATEGORIES.get(key)
+        if category:
+            return category
 
     # Unidentified - return None
     return None
 
 
-def build_runway_end(row: dict, prefix: str) -> dict | None:
-    """Build runway end dict from CSV row."""
-    ident = row.get(f"{prefix}_ident", "").strip()
+def build_runway_end(row: list[str], fields: itemgetter) -> dict | None:
+    """Build runway end dict from CSV row.
+    `fields` picks ident, lat, lon, elevation, heading and displaced
+    threshold for one end out of the row."""
+    ident, lat, lon, elev, hdg, dt = fields(row)
+
+    ident = ident.strip()
     if not ident:
         return None
 
-    end = {"id": ident}
+    # Idents come from a tiny alphabet ("09", "27L", "H1"), so share one
+    # string object per distinct value instead of one per runway end
+    end = {"id": sys.intern(ident)}
 
-    lat = parse_float(row.get(f"{prefix}_latitude_deg", ""))
-    lon = parse_float(row.get(f"{prefix}_longitude_deg", ""))
+    lat = parse_float(lat)
+    lon = parse_float(lon)
     if lat is not None:
         end["lat"] = round(lat, 6)
     if lon is not None:
         end["lon"] = round(lon, 6)
 
-    elev = parse_int(row.get(f"{prefix}_elevation_ft", ""))
+    elev = parse_int(elev)
     if elev is not None:
         end["elev"] = elev
 
-    hdg = parse_float(row.get(f"{prefix}_heading_degT", ""))
+    hdg = parse_float(hdg)
     if hdg is not None:
         end["hdg"] = round(hdg, 1)
 
-    dt = parse_int(row.get(f"{prefix}_displaced_threshold_ft", ""))
+    dt = parse_int(dt)
     if dt is not None and dt > 0:
         end["dt"] = dt
 
     return end
 
 
+def encode(value) -> bytes:
+    """Compact JSON encoding (no spaces)."""
+    if orjson:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
 def main():
     if not INPUT_FILE.exists():
         print(f"Error: {INPUT_FILE} not found")
         sys.exit(1)
 
-    runways_by_icao: dict[str, list] = {}
+    runways_by_icao: defaultdict[str, list] = defaultdict(list)
     unknown_surfaces: set[str] = set()
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
+    with open(INPUT_FILE, "r", newline="", encoding="utf-8", buffering=BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+
+        # Resolve column positions once from the header row
+        header = next(reader, None)
+        if header is None:
+            print(f"Error: {INPUT_FILE} is empty")
+            sys.exit(1)
+        idx = {h: i for i, h in enumerate(header)}
+
+        # Pull the runway columns out of a row in a single C-level call
+        columns = itemgetter(
+            idx["airport_ident"],
+            idx["length_ft"],
+            idx["width_ft"],
+            idx["surface"],
+            idx["lighted"],
+            idx["closed"],
+        )
+        le_fields = itemgetter(*(idx[name] for name in LE_FIELDS))
+        he_fields = itemgetter(*(idx[name] for name in HE_FIELDS))
+
+        # Bind hot-loop helpers to locals to skip a global lookup per call
+        _parse_int = parse_int
+        _categorize = categorize_surface
+        _build_end = build_runway_end
+
+        ncols = len(header)
         for row in reader:
-            icao = row.get("airport_ident", "").strip()
+            # Blank lines come through csv.reader as []
+            if not row:
+                continue
+            # Pad short rows with empty fields, as DictReader did for
+            # missing columns
+            if len(row) < ncols:
+                row += [""] * (ncols - len(row))
+
+            icao, length, width, surface_raw, lighted, closed = columns(row)
+            icao = icao.strip()
             if not icao:
                 continue
 
             runway = {}
 
             # Length and width
-            length = parse_int(row.get("length_ft", ""))
-            width = parse_int(row.get("width_ft", ""))
+            length = _parse_int(length)
+            width = _parse_int(width)
             if length:
                 runway["l"] = length
             if width:
                 runway["w"] = width
 
             # Surface - categorize into standard types
-            surface_raw = row.get("surface", "").strip()
-            surface_cat = categorize_surface(surface_raw)
+            surface_raw = surface_raw.strip()
+            surface_cat = _categorize(surface_raw)
             if surface_cat:
                 runway["s"] = surface_cat
             # Track unidentified surfaces for stats
@@ -202,16 +283,14 @@ def main():
                 unknown_surfaces.add(surface_raw.upper())
 
             # Lighted and closed
-            lighted = row.get("lighted", "0")
-            closed = row.get("closed", "0")
             if lighted == "1":
                 runway["lit"] = 1
             if closed == "1":
                 runway["cls"] = 1
 
             # Runway ends
-            le = build_runway_end(row, "le")
-            he = build_runway_end(row, "he")
+            le = _build_end(row, le_fields)
+            he = _build_end(row, he_fields)
             if le:
                 runway["le"] = le
             if he:
@@ -219,21 +298,24 @@ def main():
 
             # Only add if we have at least one end
             if le or he:
-                if icao not in runways_by_icao:
-                    runways_by_icao[icao] = []
                 runways_by_icao[icao].append(runway)
 
-    # Sort by ICAO
-    sorted_data = dict(sorted(runways_by_icao.items()))
-
-    # Write output
+    # Write output, streaming airports in ICAO order instead of building a
+    # sorted copy of the whole dict (runway fields keep their order)
     OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(sorted_data, f, separators=(",", ":"))
+    with open(OUTPUT_FILE, "wb", buffering=BUFFER_SIZE) as f:
+        f.write(b"{")
+        for n, icao in enumerate(sorted(runways_by_icao)):
+            if n:
+                f.write(b",")
+            f.write(encode(icao))
+            f.write(b":")
+            f.write(encode(runways_by_icao[icao]))
+        f.write(b"}")
 
     # Stats
-    total_airports = len(sorted_data)
-    total_runways = sum(len(v) for v in sorted_data.values())
+    total_airports = len(runways_by_icao)
+    total_runways = sum(len(v) for v in runways_by_icao.values())
     size_kb = OUTPUT_FILE.stat().st_size / 1024
 
     print(f"Done! {total_airports} airports, {total_runways} runways")